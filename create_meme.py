@@ -1,34 +1,95 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from PIL import Image, ImageDraw
+
+from step4_create_block_letter import _get_font
+
+
+# ITU-R BT.601 luma weights
+_LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def _to_gray(arr: np.ndarray) -> np.ndarray:
+    """
+    Convert an (H, W, C) image to (H, W) grayscale using BT.601 weights.
+
+    uint8 input stays in integer arithmetic (weights 77/150/29 out of 256);
+    anything else is reduced with a dot product over the channel axis.
+    """
+    if arr.shape[2] < 3:
+        return arr[..., 0]
+
+    if arr.dtype == np.uint8:
+        r = arr[..., 0].astype(np.uint16)
+        g = arr[..., 1].astype(np.uint16)
+        b = arr[..., 2].astype(np.uint16)
+        return ((r * 77 + g * 150 + b * 29) >> 8).astype(np.uint8)
+
+    return np.tensordot(arr[..., :3], _LUMA_WEIGHTS, axes=1)
 
 
 def _prepare_image(img: np.ndarray) -> np.ndarray:
     """
-    Ensure the image is 2D float in [0, 1].
+    Ensure the image is 2D uint8, stretched to the full [0, 255] range.
 
-    Accepts 2D or 3D arrays (H, W) or (H, W, C).
+    Accepts 2D or 3D arrays (H, W) or (H, W, C). A uint8 image that
+    already spans [0, 255] is returned without copying.
     """
     arr = np.asarray(img)
 
     if arr.ndim == 3:
-        # Convert RGB to grayscale by averaging channels
-        arr = arr.mean(axis=2)
+        arr = _to_gray(arr)
 
     if arr.ndim != 2:
         raise ValueError(
             f"Expected a 2D or 3D array for an image, got shape {arr.shape}"
         )
 
-    arr = arr.astype(np.float32)
-    # Normalize to [0, 1] just in case
     arr_min = float(arr.min())
     arr_max = float(arr.max())
-    if arr_max > arr_min:
-        arr = (arr - arr_min) / (arr_max - arr_min)
-    else:
-        arr = np.zeros_like(arr, dtype=np.float32)
+    if arr_max <= arr_min:
+        return np.zeros(arr.shape, dtype=np.uint8)
+
+    if arr.dtype == np.uint8:
+        if arr_min == 0 and arr_max == 255:
+            # Already full range (e.g. the block letter mask): nothing to do
+            return np.ascontiguousarray(arr)
+
+        # Only 256 possible inputs: build the stretch as a lookup table and
+        # apply it with a single gather
+        lut = np.arange(256, dtype=np.float32)
+        lut -= arr_min
+        lut *= 255.0 / (arr_max - arr_min)
+        # Round half up (+0.5, then truncate) exactly like the float path
+        lut += np.float32(0.5)
+        lut = np.clip(lut, 0, 255).astype(np.uint8)
+        return lut[arr]
+
+    # Subtract the minimum first (in the input's precision, written into
+    # the one float32 working buffer) so values far from zero don't cancel
+    # catastrophically; scaling and rounding then run in place.
+    work = np.empty(arr.shape, dtype=np.float32)
+    np.subtract(arr, arr_min, out=work, casting="same_kind")
+    work *= np.float32(255.0 / (arr_max - arr_min))
+    work += np.float32(0.5)
+    # Guard against float error pushing the top value past 255 (which
+    # would wrap in the uint8 cast)
+    np.clip(work, 0, 255, out=work)
+
+    return work.astype(np.uint8)
+
+
+def _crops(arrs: tuple[np.ndarray, ...], h: int, w: int) -> list[np.ndarray]:
+    """
+    Center-crop each 2D array in arrs to (h, w).
 
-    return arr
+    Returns views, not copies.
+    """
+    out = []
+    for a in arrs:
+        dh = (a.shape[0] - h) // 2
+        dw = (a.shape[1] - w) // 2
+        out.append(a[dh:dh + h, dw:dw + w])
+    return out
 
 
 def create_statistics_meme(
@@ -56,9 +117,9 @@ def create_statistics_meme(
     output_path : str
         Path where the final meme PNG will be saved.
     dpi : int, optional
-        Dots per inch for the saved figure. Default is 150.
+        DPI recorded in the saved PNG's metadata. Default is 150.
     background_color : str, optional
-        Figure background color. Default is "white".
+        Canvas background color (any Pillow color name). Default is "white".
     """
     # Prepare / normalize all images
     orig = _prepare_image(original_img)
@@ -68,30 +129,16 @@ def create_statistics_meme(
 
     # Make sure they are all the same size by center-cropping to
     # the smallest common height/width (just in case)
-    heights = [orig.shape[0], stip.shape[0], mask_letter.shape[0], masked.shape[0]]
-    widths = [orig.shape[1], stip.shape[1], mask_letter.shape[1], masked.shape[1]]
-    h_min = min(heights)
-    w_min = min(widths)
-
-    def center_crop(a: np.ndarray) -> np.ndarray:
-        h, w = a.shape
-        top = max((h - h_min) // 2, 0)
-        left = max((w - w_min) // 2, 0)
-        return a[top:top + h_min, left:left + w_min]
-
-    orig_c = center_crop(orig)
-    stip_c = center_crop(stip)
-    letter_c = center_crop(mask_letter)
-    masked_c = center_crop(masked)
-
-    # Create figure and axes
-    fig, axes = plt.subplots(
-        1,
-        4,
-        figsize=(14, 4),
-        constrained_layout=True
-    )
-    fig.patch.set_facecolor(background_color)
+    shapes = {a.shape for a in (orig, stip, mask_letter, masked)}
+    if len(shapes) == 1:
+        # Common case: every panel comes from the same source image
+        orig_c, stip_c, letter_c, masked_c = orig, stip, mask_letter, masked
+    else:
+        h_min = min(shape[0] for shape in shapes)
+        w_min = min(shape[1] for shape in shapes)
+        orig_c, stip_c, letter_c, masked_c = _crops(
+            (orig, stip, mask_letter, masked), h_min, w_min
+        )
 
     panels = [
         ("Reality", orig_c),
@@ -100,33 +147,41 @@ def create_statistics_meme(
         ("Estimate", masked_c),
     ]
 
-    for ax, (title, img) in zip(axes, panels):
-        ax.imshow(img, cmap="gray", vmin=0, vmax=1)
-        ax.set_title(title, fontsize=12, fontweight="bold", pad=8)
-        ax.axis("off")
-        ax.set_facecolor(background_color)
+    # Composite the panels directly with Pillow (no Matplotlib figure,
+    # so no Agg rasterization or tight-bbox second draw pass)
+    H, W = orig_c.shape
+    gap = 16
+    title_h = 24
+    font = _get_font(14)
+
+    # Each column is at least as wide as the widest title so small panels
+    # don't make neighbouring titles run together; panels are centered
+    title_w = max(int(np.ceil(font.getlength(title))) for title, _ in panels)
+    col_w = max(W, title_w)
+
+    # RGB canvas so colored backgrounds are honored; the grayscale
+    # tiles are converted as they are pasted
+    canvas = Image.new(
+        "RGB", (4 * col_w + 3 * gap, H + title_h), background_color
+    )
+    draw = ImageDraw.Draw(canvas)
+
+    for i, (title, img) in enumerate(panels):
+        col_x = i * (col_w + gap)
+        x = col_x + (col_w - W) // 2
+        canvas.paste(Image.fromarray(img), (x, title_h))
 
         # Simple thin border to make it look more “panel-y”
-        for spine in ax.spines.values():
-            spine.set_visible(True)
-            spine.set_linewidth(1.0)
-            spine.set_edgecolor("black")
-
-    # Optional overall title (comment out if you don't want it)
-    # fig.suptitle(
-    #     "Selection Bias: What You See vs. Reality",
-    #     fontsize=14,
-    #     fontweight="bold",
-    # )
-
-    # Save and close
-    fig.savefig(
-        output_path,
-        dpi=dpi,
-        facecolor=background_color,
-        bbox_inches="tight"
-    )
-    plt.close(fig)
+        draw.rectangle(
+            (x, title_h, x + W - 1, title_h + H - 1), outline="black", width=1
+        )
+        draw.text(
+            (col_x + col_w // 2, 4), title, fill="black", font=font,
+            anchor="mt"
+        )
+
+    # compress_level=1 trades a slightly larger file for a much faster write
+    canvas.save(output_path, format="PNG", dpi=(dpi, dpi), compress_level=1)
 
 
 if __name__ == "__main__":
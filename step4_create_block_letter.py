@@ -1,12 +1,21 @@
+from functools import lru_cache
+
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from typing import Optional
 
 
-def _get_font(font_size: int) -> ImageFont.FreeTypeFont:
+# Masks whose smaller side exceeds _FULL_RES_LIMIT are rendered with the
+# smaller side at _LOW_RES_SIZE and upsampled
+_FULL_RES_LIMIT = 512
+_LOW_RES_SIZE = 256
+
+
+@lru_cache(maxsize=None)
+def _resolve_font_path() -> Optional[str]:
     """
-    Try to load a bold-ish font that should exist on most systems.
-    Fall back to the default PIL font if none are found.
+    Find a bold-ish font that should exist on most systems.
+    Returns None if none of the candidates can be loaded.
     """
     font_candidates = [
         # Common cross-platform font names
@@ -21,10 +30,28 @@ def _get_font(font_size: int) -> ImageFont.FreeTypeFont:
 
     for font_path in font_candidates:
         try:
-            return ImageFont.truetype(font_path, font_size)
+            ImageFont.truetype(font_path, 12)
+            return font_path
         except Exception:
             continue
 
+    return None
+
+
+@lru_cache(maxsize=64)
+def _get_font(font_size: int) -> ImageFont.FreeTypeFont:
+    """
+    Load the resolved font at the given size (cached per size).
+    Fall back to the default PIL font if none are found.
+    """
+    font_path = _resolve_font_path()
+    if font_path is not None:
+        try:
+            # FreeType rejects a size of 0 (e.g. for tiny masks)
+            return ImageFont.truetype(font_path, max(1, font_size))
+        except Exception:
+            pass
+
     # Fallback: default bitmap font (not ideal but better than crashing)
     return ImageFont.load_default()
 
@@ -53,8 +80,8 @@ def create_block_letter_s(
     Returns
     -------
     np.ndarray
-        2D array of shape (height, width) with values in [0, 1],
-        where 0.0 = black letter and 1.0 = white background.
+        2D writable uint8 array of shape (height, width), where
+        0 = black letter and 255 = white background.
     """
     if height <= 0 or width <= 0:
         raise ValueError("height and width must be positive integers")
@@ -62,12 +89,22 @@ def create_block_letter_s(
     # Clamp font_size_ratio to (0, 1]
     font_size_ratio = max(0.1, min(1.0, font_size_ratio))
 
+    # Glyph rasterization cost grows with font size, so large masks are
+    # drawn on a small canvas and upsampled at the end (edges come out
+    # blockier than a full-resolution render)
+    if min(height, width) > _FULL_RES_LIMIT:
+        scale = _LOW_RES_SIZE / min(height, width)
+        render_h = max(1, round(height * scale))
+        render_w = max(1, round(width * scale))
+    else:
+        render_h, render_w = height, width
+
     # Create a white background grayscale image
-    img = Image.new("L", (width, height), color=255)  # "L" = 8-bit grayscale
+    img = Image.new("L", (render_w, render_h), color=255)  # "L" = 8-bit grayscale
     draw = ImageDraw.Draw(img)
 
     # Choose font size based on the smaller dimension
-    base_size = int(min(height, width) * font_size_ratio)
+    base_size = int(min(render_h, render_w) * font_size_ratio)
     font = _get_font(base_size)
 
     # Compute bounding box for the letter to center it
@@ -82,21 +119,26 @@ def create_block_letter_s(
         text_width, text_height = draw.textsize(text, font=font)
 
     # Center the letter
-    x = (width - text_width) / 2
-    y = (height - text_height) / 2
+    x = (render_w - text_width) / 2
+    y = (render_h - text_height) / 2
 
     # Draw the letter in black on white background
     draw.text((x, y), text, font=font, fill=0)
 
-    # Convert to numpy array in [0, 1]
-    arr = np.array(img).astype(np.float32) / 255.0
+    if (render_h, render_w) != (height, width):
+        # Threshold the anti-aliased render first so the upsampled mask
+        # stays strictly 0/255 instead of carrying enlarged gray edge blocks
+        img = img.point(lambda v: 255 if v >= 128 else 0)
+        img = img.resize((width, height), Image.Resampling.NEAREST)
 
-    return arr
+    # "L" images are already uint8; consumers threshold this directly, so
+    # there is no need to widen it to float32 here
+    return np.array(img)
 
 
 if __name__ == "__main__":
     # Simple manual test (optional): saves a preview image
     h, w = 512, 512
     mask = create_block_letter_s(h, w, letter="S", font_size_ratio=0.9)
-    preview = Image.fromarray((mask * 255).astype(np.uint8))
+    preview = Image.fromarray(mask)
     preview.save("debug_block_letter_s.png")
@@ -13,21 +13,25 @@ def create_masked_stipple(
     ----------
     stipple_img : np.ndarray
         2D array (H x W) with values in [0, 1], where 0 = black dots,
-        1 = white background (your stippled image).
+        1 = white background (your stippled image). A uint8 stipple
+        in [0, 255] is also accepted.
     mask_img : np.ndarray
-        2D array (H x W) with values in [0, 1], where 0 = black mask area
-        and 1 = white background (your block letter image).
+        2D uint8 array (H x W) with values in [0, 255], where 0 = black
+        mask area and 255 = white background (your block letter image).
+        A float mask in [0, 1] is also accepted.
     threshold : float, optional
-        Pixels in the mask with values < threshold are considered part of
-        the "mask" region and will have stipples removed (set to white/1.0).
+        Pixels in the mask below threshold are considered part of the
+        "mask" region and will have stipples removed (set to white).
+        Given on the [0, 1] scale; for uint8 masks it is compared
+        against threshold * 255.
         Default is 0.5.
 
     Returns
     -------
     np.ndarray
-        2D array (H x W) with values in [0, 1], where pixels in the masked
-        region are white (1.0) and other pixels keep the original stipple
-        values.
+        2D array (H x W) with the stipple's dtype (float32 or uint8), where
+        pixels in the masked region are white (1.0 or 255) and other pixels
+        keep the original stipple values.
     """
     # Basic shape check
     if stipple_img.shape != mask_img.shape:
@@ -36,15 +40,32 @@ def create_masked_stipple(
             f"got {stipple_img.shape} and {mask_img.shape}"
         )
 
-    # Ensure float32 and clamp to [0, 1]
-    stipple = np.clip(stipple_img.astype(np.float32), 0.0, 1.0)
-    mask = np.clip(mask_img.astype(np.float32), 0.0, 1.0)
+    # Inputs are already in range (see the docstring), so no clamping;
+    # uint8 and float32 arrays pass through without a copy
+    stipple = np.ascontiguousarray(stipple_img)
+    if stipple.dtype == np.uint8:
+        white = np.uint8(255)
+    else:
+        stipple = stipple.astype(np.float32, copy=False)
+        white = np.float32(1.0)
+
+    mask = np.ascontiguousarray(mask_img)
+    if mask.dtype == np.uint8:
+        threshold = threshold * 255
+        if np.isfinite(threshold):
+            # Integer threshold so the comparison stays in uint8;
+            # m < ceil(t * 255) is the same test as m < t * 255 for integer m
+            threshold = int(np.ceil(threshold))
+    else:
+        mask = mask.astype(np.float32, copy=False)
 
     # True where we want to remove data (inside the letter / dark region)
     mask_region = mask < threshold
 
-    # Where mask_region is True → set to 1.0 (white), else keep stipple value
-    result = np.where(mask_region, 1.0, stipple)
+    # Copy the stipple (it may be the caller's array), then set only the
+    # mask_region pixels to white in place
+    result = stipple.copy()
+    np.putmask(result, mask_region, white)
 
     return result
 